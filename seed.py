@@ -4,6 +4,7 @@ Run with: python manage.py shell < seed.py
 """
 
 import os
+
 import django
 
 # Setup Django environment
@@ -11,21 +12,18 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'property_search.settings')
 django.setup()
 
 from django.contrib.gis.geos import Point
+from django.db import transaction
+from django.db.models import Count, Q
 from properties.models import Property, GeoBucket
 from properties.services.bucket_service import BucketService
 
+# Rows per INSERT statement when bulk creating properties
+SEED_BATCH_SIZE = int(os.getenv('SEED_BATCH_SIZE', '500'))
+
 print("Starting database seed...")
 print("=" * 60)
 
-# Clear existing data
-print("\n1. Clearing existing data...")
-Property.objects.all().delete()
-GeoBucket.objects.all().delete()
-print("✓ Database cleared")
-
 # Sample properties with Sangotedo variations (REQUIRED TEST CASE)
-print("\n2. Creating Sangotedo properties (required test case)...")
-
 sangotedo_properties = [
     {
         "title": "Modern 3BR Apartment in Sangotedo",
@@ -65,34 +63,7 @@ sangotedo_properties = [
     }
 ]
 
-for prop_data in sangotedo_properties:
-    lat = prop_data.pop('lat')
-    lng = prop_data.pop('lng')
-    location_name = prop_data['location_name']
-    
-    # Create point
-    point = Point(lng, lat, srid=4326)
-    
-    # Find or create bucket
-    bucket = BucketService.find_or_create_bucket(
-        lat=lat,
-        lng=lng,
-        location_name=location_name
-    )
-    
-    # Create property
-    prop = Property.objects.create(
-        location=point,
-        bucket=bucket,
-        **prop_data
-    )
-    print(f"  ✓ Created: {prop.title} in {location_name}")
-
-print(f"\n✓ Created {len(sangotedo_properties)} Sangotedo properties")
-
 # Additional locations
-print("\n3. Creating properties in other locations...")
-
 other_properties = [
     # Lekki Phase 1
     {
@@ -248,47 +219,63 @@ other_properties = [
     }
 ]
 
-for prop_data in other_properties:
-    lat = prop_data.pop('lat')
-    lng = prop_data.pop('lng')
-    location_name = prop_data['location_name']
+# Clear and insert in one transaction: a single COMMIT for the whole
+# seed, and a failed run leaves the previous data in place
+with transaction.atomic():
+    print("\n1. Clearing existing data...")
+    Property.objects.all().delete()
+    GeoBucket.objects.all().delete()
+    print("✓ Database cleared")
+    
+    # Insert all properties in bulk
+    print("\n2. Creating properties...")
+    
+    all_properties = sangotedo_properties + other_properties
     
-    # Create point
-    point = Point(lng, lat, srid=4326)
+    # Resolve buckets once per H3 cell rather than once per property
+    buckets = BucketService.find_or_create_buckets_bulk([
+        (prop_data['lat'], prop_data['lng'], prop_data['location_name'])
+        for prop_data in all_properties
+    ])
     
-    # Find or create bucket
-    bucket = BucketService.find_or_create_bucket(
-        lat=lat,
-        lng=lng,
-        location_name=location_name
-    )
+    properties = []
+    for prop_data, bucket in zip(all_properties, buckets):
+        lat = prop_data.pop('lat')
+        lng = prop_data.pop('lng')
+        
+        # Build property (saved below with bulk_create)
+        properties.append(Property(
+            location=Point(lng, lat, srid=4326),
+            bucket=bucket,
+            **prop_data
+        ))
     
-    # Create property
-    prop = Property.objects.create(
-        location=point,
-        bucket=bucket,
-        **prop_data
-    )
-    print(f"  ✓ Created: {prop.title} in {location_name}")
+    Property.objects.bulk_create(properties, batch_size=SEED_BATCH_SIZE)
 
-print(f"\n✓ Created {len(other_properties)} additional properties")
+# Emit the per-property log as a single write
+print("\n".join(
+    f"  ✓ Created: {prop.title} in {prop.location_name}"
+    for prop in properties
+))
+
+print(f"\n✓ Created {len(sangotedo_properties)} Sangotedo properties")
+print(f"✓ Created {len(other_properties)} additional properties")
 
 # Display statistics
-print("\n4. Database Statistics:")
+print("\n3. Database Statistics:")
 print("=" * 60)
 
-total_properties = Property.objects.count()
-total_buckets = GeoBucket.objects.count()
-sangotedo_count = Property.objects.filter(
-    location_name__icontains='sangotedo'
-).count()
+stats = BucketService.get_bucket_stats()
+property_stats = Property.objects.aggregate(
+    total=Count('id'),
+    sangotedo=Count('id', filter=Q(location_name__icontains='sangotedo'))
+)
 
-print(f"Total Properties: {total_properties}")
-print(f"Total Geo-Buckets: {total_buckets}")
-print(f"Sangotedo Properties: {sangotedo_count}")
+print(f"Total Properties: {property_stats['total']}")
+print(f"Total Geo-Buckets: {stats['total_buckets']}")
+print(f"Sangotedo Properties: {property_stats['sangotedo']}")
 
 # Display bucket stats
-stats = BucketService.get_bucket_stats()
 print(f"\nBucket Statistics:")
 print(f"  - Buckets with properties: {stats['buckets_with_properties']}")
 print(f"  - Empty buckets: {stats['empty_buckets']}")
@@ -296,15 +283,16 @@ print(f"  - Avg properties per bucket: {stats['avg_properties_per_bucket']}")
 print(f"  - Max properties in a bucket: {stats['max_properties_in_bucket']}")
 
 # Display location distribution
-print("\n5. Properties by Location:")
+print("\n4. Properties by Location:")
 print("=" * 60)
 
-from django.db.models import Count
+# Stream rows with a server-side cursor so memory stays flat as the
+# number of buckets grows
 location_counts = Property.objects.values('bucket__normalized_name').annotate(
     count=Count('id')
 ).order_by('-count')
 
-for item in location_counts:
+for item in location_counts.iterator(chunk_size=500):
     location = item['bucket__normalized_name'] or 'No Bucket'
     count = item['count']
     print(f"  {location}: {count} properties")
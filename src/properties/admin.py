@@ -1,7 +1,21 @@
 from django.contrib.gis import admin
+from django.contrib.admin.views.main import ChangeList
 from properties.models import GeoBucket, Property, LocationIndex
 
 
+class GeoBucketChangeList(ChangeList):
+    """Changelist that skips columns the bucket list doesn't display."""
+    
+    def get_queryset(self, request, *args, **kwargs):
+        queryset = super().get_queryset(request, *args, **kwargs)
+        return queryset.defer(
+            'variant_names',
+            'normalized_variants',
+            'variant_metaphones',
+            'centroid'
+        )
+
+
 # Register your models here.
 @admin.register(GeoBucket)
 class GeoBucketAdmin(admin.GISModelAdmin):
@@ -15,6 +29,7 @@ class GeoBucketAdmin(admin.GISModelAdmin):
         'created_at'
     ]
     list_filter = ['created_at', 'property_count']
+    ordering = ['-property_count', 'normalized_name']
     search_fields = ['normalized_name', 'h3_index', 'variant_names']
     readonly_fields = ['h3_index', 'property_count', 'created_at', 'updated_at']
     
@@ -33,6 +48,10 @@ class GeoBucketAdmin(admin.GISModelAdmin):
         }),
     )
     
+    def get_changelist(self, request, **kwargs):
+        """Defer heavy columns on the list page only; the form needs them."""
+        return GeoBucketChangeList
+    
     def h3_index_short(self, obj):
         """Display shortened H3 index."""
         return f"{obj.h3_index[:8]}..."
@@ -59,6 +78,8 @@ class PropertyAdmin(admin.GISModelAdmin):
         'created_at'
     ]
     list_filter = ['bedrooms', 'bathrooms', 'created_at', 'bucket']
+    list_select_related = ['bucket']
+    ordering = ['-created_at']
     search_fields = ['title', 'location_name', 'bucket__normalized_name']
     readonly_fields = ['created_at', 'updated_at']
     
@@ -98,6 +119,7 @@ class LocationIndexAdmin(admin.ModelAdmin):
         'created_at'
     ]
     list_filter = ['created_at']
+    list_select_related = ['bucket']
     search_fields = ['original_name', 'normalized_name', 'metaphone']
     readonly_fields = ['created_at']
     
@@ -1,5 +1,17 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate, pre_migrate
 
 
 class PropertiesConfig(AppConfig):
     name = 'properties'
+
+    def ready(self):
+        from properties.signals import (
+            backfill_variant_keys,
+            create_required_extensions,
+            install_triggers,
+        )
+
+        pre_migrate.connect(create_required_extensions, sender=self)
+        post_migrate.connect(install_triggers, sender=self)
+        post_migrate.connect(backfill_variant_keys, sender=self)
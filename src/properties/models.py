@@ -3,8 +3,11 @@ from django.db import models
 # Create your models here.
 from django.contrib.gis.db import models
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex, OpClass, SpGistIndex
+from django.db.models.functions import Upper
 from django.core.validators import MinValueValidator
 from decimal import Decimal
+from properties.services.normalization import LocationNormalizer
 
 
 class GeoBucket(models.Model):
@@ -34,10 +37,24 @@ class GeoBucket(models.Model):
         blank=True,
         help_text="Array of location name variations"
     )
+    normalized_variants = ArrayField(
+        models.CharField(max_length=255),
+        default=list,
+        blank=True,
+        editable=False,
+        help_text="Distinct normalized forms of variant_names"
+    )
+    variant_metaphones = ArrayField(
+        models.CharField(max_length=50),
+        default=list,
+        blank=True,
+        editable=False,
+        help_text="Distinct metaphone codes of normalized_variants"
+    )
     property_count = models.IntegerField(
         default=0,
         validators=[MinValueValidator(0)],
-        help_text="Number of properties in this bucket"
+        help_text="Number of properties in this bucket (maintained by a database trigger)"
     )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -47,31 +64,42 @@ class GeoBucket(models.Model):
         indexes = [
             models.Index(fields=['normalized_name']),
             models.Index(fields=['h3_index']),
+            GinIndex(fields=['variant_metaphones']),
         ]
-        ordering = ['-property_count', 'normalized_name']
+
+    # Columns derived from variant_names by sync_variant_keys()
+    VARIANT_KEY_FIELDS = ['normalized_variants', 'variant_metaphones']
 
     def __str__(self):
         return f"{self.normalized_name} (H3: {self.h3_index[:8]}...)"
 
+    def save(self, *args, **kwargs):
+        """
+        Keep the variant matching keys in step with variant_names.
+        
+        Deriving them on write means search can compare variants directly.
+        Bulk writes call sync_variant_keys() themselves.
+        """
+        if 'variant_names' not in self.get_deferred_fields():
+            self.sync_variant_keys()
+            
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None and 'variant_names' in update_fields:
+                kwargs['update_fields'] = {*update_fields, *self.VARIANT_KEY_FIELDS}
+        super().save(*args, **kwargs)
+
+    def sync_variant_keys(self):
+        """Derive normalized_variants and variant_metaphones from variant_names."""
+        self.normalized_variants, self.variant_metaphones = (
+            LocationNormalizer.variant_keys(self.variant_names)
+        )
+
     def add_variant_name(self, name: str):
         """Add a new location name variant if not already present."""
         if name and name not in self.variant_names:
             self.variant_names.append(name)
             self.save(update_fields=['variant_names', 'updated_at'])
 
-    def increment_property_count(self):
-        """Atomically increment the property count."""
-        self.property_count = models.F('property_count') + 1
-        self.save(update_fields=['property_count', 'updated_at'])
-        self.refresh_from_db()
-
-    def decrement_property_count(self):
-        """Atomically decrement the property count."""
-        if self.property_count > 0:
-            self.property_count = models.F('property_count') - 1
-            self.save(update_fields=['property_count', 'updated_at'])
-            self.refresh_from_db()
-
 
 class Property(models.Model):
     """
@@ -84,12 +112,12 @@ class Property(models.Model):
     )
     location_name = models.CharField(
         max_length=255,
-        db_index=True,
         help_text="Original location name as provided by user"
     )
     location = models.PointField(
         geography=True,
         srid=4326,
+        spatial_index=False,
         help_text="Geographic coordinates (lat, lng)"
     )
     bucket = models.ForeignKey(
@@ -100,6 +128,14 @@ class Property(models.Model):
         related_name='properties',
         help_text="Assigned geo-bucket"
     )
+    h3_index = models.CharField(
+        max_length=15,
+        null=True,
+        blank=True,
+        editable=False,
+        db_index=True,
+        help_text="Copy of the bucket's H3 index (maintained by a database trigger)"
+    )
     price = models.DecimalField(
         max_digits=12,
         decimal_places=2,
@@ -122,9 +158,18 @@ class Property(models.Model):
         indexes = [
             models.Index(fields=['bucket', '-created_at']),
             models.Index(fields=['-created_at']),
-            models.Index(fields=['location_name']),
+            models.Index(fields=['bucket', 'location_name']),
+            # Trigram index matching Django's icontains SQL on PostgreSQL
+            # (UPPER(col) LIKE UPPER(%term%)), so substring searches on
+            # location names don't fall back to a sequential scan
+            GinIndex(
+                OpClass(Upper('location_name'), name='gin_trgm_ops'),
+                name='prop_loc_trgm'
+            ),
+            # Point-only column: SP-GiST (PostGIS spgist_geography_ops_nd)
+            # is smaller and cheaper to maintain than the default GiST
+            SpGistIndex(fields=['location'], name='prop_location_spgist'),
         ]
-        ordering = ['-created_at']
 
     def __str__(self):
         return f"{self.title} - {self.location_name}"
@@ -140,31 +185,23 @@ class Property(models.Model):
         return self.location.x if self.location else None
 
     def save(self, *args, **kwargs):
-        """Override save to ensure bucket assignment."""
-        is_new = self.pk is None
-        old_bucket_id = None
-        
-        if not is_new:
-            old_property = Property.objects.filter(pk=self.pk).first()
-            old_bucket_id = old_property.bucket_id if old_property else None
+        """
+        Mirror the bucket's H3 index in memory.
         
+        The database trigger sets the stored value; copying it here keeps
+        the saved instance accurate without re-reading the row. The copy
+        is only made from a loaded bucket whose h3_index isn't deferred
+        (e.g. one joined with only()), so it never queries.
+        Otherwise the in-memory value is left as is.
+        """
+        if self.bucket_id is None:
+            self.h3_index = None
+        elif (
+            Property.bucket.is_cached(self)
+            and 'h3_index' not in self.bucket.get_deferred_fields()
+        ):
+            self.h3_index = self.bucket.h3_index
         super().save(*args, **kwargs)
-        
-        # Update bucket counts
-        if is_new and self.bucket:
-            self.bucket.increment_property_count()
-        elif not is_new and old_bucket_id != self.bucket_id:
-            if old_bucket_id:
-                old_bucket = GeoBucket.objects.get(pk=old_bucket_id)
-                old_bucket.decrement_property_count()
-            if self.bucket:
-                self.bucket.increment_property_count()
-
-    def delete(self, *args, **kwargs):
-        """Override delete to update bucket count."""
-        if self.bucket:
-            self.bucket.decrement_property_count()
-        super().delete(*args, **kwargs)
 
 
 class LocationIndex(models.Model):
@@ -206,8 +243,14 @@ class LocationIndex(models.Model):
         indexes = [
             models.Index(fields=['normalized_name']),
             models.Index(fields=['metaphone']),
+            GinIndex(fields=['trigrams']),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['original_name', 'bucket'],
+                name='uniq_locidx'
+            ),
         ]
-        unique_together = ['original_name', 'bucket']
 
     def __str__(self):
         return f"{self.original_name} -> {self.normalized_name}"
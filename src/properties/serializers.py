@@ -2,6 +2,7 @@ from rest_framework import serializers
 from django.contrib.gis.geos import Point
 from properties.models import Property, GeoBucket
 from properties.services.bucket_service import BucketService
+from properties.services.location_matcher import LocationMatcher
 
 
 class PropertySerializer(serializers.ModelSerializer):
@@ -19,7 +20,7 @@ class PropertySerializer(serializers.ModelSerializer):
         allow_null=True
     )
     bucket_h3_index = serializers.CharField(
-        source='bucket.h3_index',
+        source='h3_index',
         read_only=True,
         allow_null=True
     )
@@ -44,6 +45,34 @@ class PropertySerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
 
+    # Columns read when rendering a property, including its bucket
+    EAGER_LOADING_FIELDS = [
+        'id',
+        'title',
+        'location_name',
+        'location',
+        'price',
+        'bedrooms',
+        'bathrooms',
+        'created_at',
+        'updated_at',
+        'h3_index',
+        'bucket__normalized_name',
+    ]
+
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """
+        Join buckets and load only the columns this serializer reads.
+        
+        Querysets serialized with many=True must go through this (see
+        EagerLoadingMixin), otherwise every row fetches its bucket,
+        including the unused variant_names array and centroid.
+        """
+        return queryset.select_related('bucket').only(
+            *cls.EAGER_LOADING_FIELDS
+        )
+
     def validate(self, data):
         """Validate coordinates are within reasonable bounds."""
         lat = data.get('lat')
@@ -129,6 +158,56 @@ class PropertySearchSerializer(serializers.Serializer):
     created_at = serializers.DateTimeField()
 
 
+class PropertySearchQuerySerializer(serializers.Serializer):
+    """
+    Validates property search query parameters.
+    
+    Coordinates are an optional hint: if either is missing, malformed or
+    outside the trusted bounds, both are dropped and the search falls
+    back to name-only matching instead of failing.
+    """
+    
+    location = serializers.CharField(
+        max_length=255,
+        trim_whitespace=False,
+        error_messages={
+            'required': 'This query parameter is required',
+            'blank': 'This query parameter is required',
+        }
+    )
+    lat = serializers.FloatField(
+        required=False,
+        min_value=LocationMatcher.LAT_BOUNDS[0],
+        max_value=LocationMatcher.LAT_BOUNDS[1]
+    )
+    lng = serializers.FloatField(
+        required=False,
+        min_value=LocationMatcher.LNG_BOUNDS[0],
+        max_value=LocationMatcher.LNG_BOUNDS[1]
+    )
+
+    def to_internal_value(self, data):
+        """Drop invalid coordinates rather than rejecting the search."""
+        try:
+            validated = super().to_internal_value(data)
+        except serializers.ValidationError as exc:
+            if 'location' in exc.detail:
+                # Coordinate errors are never reported, even alongside
+                # a missing location
+                raise serializers.ValidationError(
+                    {'location': exc.detail['location']}
+                )
+            validated = super().to_internal_value(
+                {'location': data.get('location')}
+            )
+        
+        if 'lat' not in validated or 'lng' not in validated:
+            validated.pop('lat', None)
+            validated.pop('lng', None)
+        
+        return validated
+
+
 class GeoBucketSerializer(serializers.ModelSerializer):
     """Serializer for GeoBucket model."""
     
@@ -151,6 +230,33 @@ class GeoBucketSerializer(serializers.ModelSerializer):
         read_only_fields = fields
 
 
+class GeoBucketListSerializer(serializers.ModelSerializer):
+    """
+    Lightweight GeoBucket serializer for list endpoints.
+    
+    Omits the centroid and variant_names so list queries can skip
+    loading (and decoding) those columns; use GeoBucketSerializer for
+    the full representation.
+    """
+    
+    class Meta:
+        model = GeoBucket
+        fields = [
+            'id',
+            'h3_index',
+            'normalized_name',
+            'property_count',
+            'created_at',
+            'updated_at'
+        ]
+        read_only_fields = fields
+
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """Load only the columns this serializer reads."""
+        return queryset.only(*cls.Meta.fields)
+
+
 class BucketStatsSerializer(serializers.Serializer):
     """Serializer for bucket statistics."""
     
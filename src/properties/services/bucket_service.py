@@ -1,10 +1,24 @@
 import h3
+from functools import lru_cache
 from django.contrib.gis.geos import Point
-from typing import Optional, List, Tuple
+from django.utils import timezone
+from typing import FrozenSet, Optional, List, Tuple
 from properties.models import GeoBucket, LocationIndex
 from properties.services.normalization import LocationNormalizer
 
 
+@lru_cache(maxsize=100_000)
+def _latlng_to_cell(lat: float, lng: float, resolution: int) -> str:
+    """Cached H3 cell lookup; repeated coordinates skip the C call."""
+    return h3.latlng_to_cell(lat, lng, resolution)
+
+
+@lru_cache(maxsize=50_000)
+def _grid_disk(h3_index: str, k: int) -> FrozenSet[str]:
+    """Cached neighbor ring; a cell's neighbors never change."""
+    return frozenset(h3.grid_disk(h3_index, k))
+
+
 class BucketService:
     """
     Service for managing geo-buckets and property assignments.
@@ -13,6 +27,9 @@ class BucketService:
     
     # H3 resolution 9: ~174m diameter hexagons
     H3_RESOLUTION = 9
+    
+    # Rows per INSERT when bulk creating location index entries
+    LOCATION_INDEX_BATCH_SIZE = 500
 
     @classmethod
     def calculate_h3_index(cls, lat: float, lng: float) -> str:
@@ -26,10 +43,30 @@ class BucketService:
         Returns:
             H3 index string
         """
-        return h3.latlng_to_cell(lat, lng, cls.H3_RESOLUTION)
+        return _latlng_to_cell(lat, lng, cls.H3_RESOLUTION)
 
     @classmethod
-    def get_h3_neighbors(cls, h3_index: str) -> List[str]:
+    def calculate_h3_indices(
+        cls,
+        coordinates: List[Tuple[float, float]]
+    ) -> List[str]:
+        """
+        Calculate H3 indices for many coordinates at once.
+        
+        Args:
+            coordinates: List of (lat, lng) tuples
+            
+        Returns:
+            List of H3 index strings, in input order
+        """
+        resolution = cls.H3_RESOLUTION
+        return [
+            _latlng_to_cell(lat, lng, resolution)
+            for lat, lng in coordinates
+        ]
+
+    @classmethod
+    def get_h3_neighbors(cls, h3_index: str) -> FrozenSet[str]:
         """
         Get neighboring H3 cells (ring-1).
         
@@ -37,13 +74,12 @@ class BucketService:
             h3_index: Center H3 index
             
         Returns:
-            List of neighboring H3 indices (includes center)
+            Set of neighboring H3 indices (includes center)
         """
-        neighbors = h3.grid_disk(h3_index, 1)
-        return list(neighbors)
+        return _grid_disk(h3_index, 1)
 
     @classmethod
-    def get_h3_neighbors_extended(cls, h3_index: str) -> List[str]:
+    def get_h3_neighbors_extended(cls, h3_index: str) -> FrozenSet[str]:
         """
         Get extended neighbors (ring-2) for broader search.
         
@@ -51,10 +87,9 @@ class BucketService:
             h3_index: Center H3 index
             
         Returns:
-            List of H3 indices within 2-ring distance
+            Set of H3 indices within 2-ring distance
         """
-        neighbors = h3.grid_disk(h3_index, 2)
-        return list(neighbors)
+        return _grid_disk(h3_index, 2)
 
     @classmethod
     def h3_to_coordinates(cls, h3_index: str) -> Tuple[float, float]:
@@ -125,6 +160,106 @@ class BucketService:
         
         return bucket
 
+    @classmethod
+    def find_or_create_buckets_bulk(
+        cls,
+        locations: List[Tuple[float, float, str]]
+    ) -> List[GeoBucket]:
+        """
+        Find or create buckets for many locations at once.
+        
+        Each distinct H3 cell is resolved once: existing buckets are
+        fetched in a single query and missing ones are inserted with
+        one bulk_create, instead of a lookup per location.
+        
+        Args:
+            locations: List of (lat, lng, location_name) tuples
+            
+        Returns:
+            List of GeoBucket instances, one per input location
+        """
+        if not locations:
+            return []
+        
+        h3_indices = cls.calculate_h3_indices(
+            [(lat, lng) for lat, lng, _ in locations]
+        )
+        
+        # Location names per cell, in input order
+        names_by_cell = {}
+        for h3_index, (_, _, location_name) in zip(h3_indices, locations):
+            names = names_by_cell.setdefault(h3_index, [])
+            if location_name not in names:
+                names.append(location_name)
+        
+        buckets = GeoBucket.objects.in_bulk(
+            list(names_by_cell),
+            field_name='h3_index'
+        )
+        
+        missing = [h3_index for h3_index in names_by_cell if h3_index not in buckets]
+        if missing:
+            new_buckets = []
+            for h3_index in missing:
+                location_name = names_by_cell[h3_index][0]
+                centroid_lat, centroid_lng = cls.h3_to_coordinates(h3_index)
+                bucket = GeoBucket(
+                    h3_index=h3_index,
+                    centroid=Point(centroid_lng, centroid_lat, srid=4326),
+                    normalized_name=LocationNormalizer.normalize(location_name),
+                    variant_names=[location_name] if location_name else []
+                )
+                bucket.sync_variant_keys()
+                new_buckets.append(bucket)
+            
+            # Conflicts mean another writer created the cell first;
+            # re-read so every bucket has a primary key either way
+            GeoBucket.objects.bulk_create(new_buckets, ignore_conflicts=True)
+            buckets.update(GeoBucket.objects.in_bulk(
+                missing,
+                field_name='h3_index'
+            ))
+        
+        # Record new variant names and add every name to the index
+        changed_buckets = []
+        index_entries = []
+        for h3_index, names in names_by_cell.items():
+            bucket = buckets[h3_index]
+            new_names = [
+                name for name in names
+                if name and name not in bucket.variant_names
+            ]
+            if new_names:
+                bucket.variant_names.extend(new_names)
+                bucket.sync_variant_keys()
+                bucket.updated_at = timezone.now()
+                changed_buckets.append(bucket)
+            
+            index_entries.extend(
+                cls._build_location_index(
+                    bucket,
+                    name,
+                    LocationNormalizer.normalize(name)
+                )
+                for name in names
+            )
+        
+        if changed_buckets:
+            GeoBucket.objects.bulk_update(
+                changed_buckets,
+                ['variant_names', *GeoBucket.VARIANT_KEY_FIELDS, 'updated_at']
+            )
+        
+        # Names already indexed for a bucket are skipped by the
+        # (original_name, bucket) unique constraint
+        LocationIndex.objects.bulk_create(
+            index_entries,
+            batch_size=cls.LOCATION_INDEX_BATCH_SIZE,
+            ignore_conflicts=True
+        )
+        
+        return [buckets[h3_index] for h3_index in h3_indices]
+
     @classmethod
     def _add_to_location_index(
         cls,
@@ -140,25 +275,37 @@ class BucketService:
             original_name: Original location name
             normalized_name: Normalized location name
         """
-        # Check if already indexed
-        exists = LocationIndex.objects.filter(
-            original_name=original_name,
-            bucket=bucket
-        ).exists()
-        
-        if exists:
-            return
-        
-        # Generate trigrams and metaphone
-        trigrams = LocationNormalizer.generate_trigrams(normalized_name)
-        metaphone = LocationNormalizer.metaphone_simple(normalized_name)
+        # Names already indexed for this bucket are skipped by the
+        # (original_name, bucket) unique constraint
+        LocationIndex.objects.bulk_create(
+            [cls._build_location_index(bucket, original_name, normalized_name)],
+            ignore_conflicts=True
+        )
+
+    @classmethod
+    def _build_location_index(
+        cls,
+        bucket: GeoBucket,
+        original_name: str,
+        normalized_name: str
+    ) -> LocationIndex:
+        """
+        Build an unsaved location index entry with its fuzzy matching keys.
         
-        LocationIndex.objects.create(
+        Args:
+            bucket: GeoBucket instance
+            original_name: Original location name
+            normalized_name: Normalized location name
+            
+        Returns:
+            Unsaved LocationIndex instance
+        """
+        return LocationIndex(
             original_name=original_name,
             normalized_name=normalized_name,
             bucket=bucket,
-            metaphone=metaphone,
-            trigrams=trigrams
+            metaphone=LocationNormalizer.metaphone_simple(normalized_name),
+            trigrams=sorted(LocationNormalizer.generate_trigrams(normalized_name))
         )
 
     @classmethod
@@ -169,10 +316,23 @@ class BucketService:
         Returns:
             Dictionary with bucket statistics
         """
-        from django.db.models import Count, Avg, Max, Min
+        from django.db.models import Count, Avg, Max, Min, Q, Sum
+        
+        # Single scan of geo_buckets: property_count is kept exact by the
+        # database trigger, so no join against properties is needed
+        stats = GeoBucket.objects.aggregate(
+            total_buckets=Count('id'),
+            total_properties=Sum('property_count'),
+            avg_properties=Avg('property_count'),
+            max_properties=Max('property_count'),
+            min_properties=Min('property_count'),
+            buckets_with_properties=Count(
+                'id',
+                filter=Q(property_count__gt=0)
+            )
+        )
         
-        buckets = GeoBucket.objects.all()
-        total_buckets = buckets.count()
+        total_buckets = stats['total_buckets']
         
         if total_buckets == 0:
             return {
@@ -185,14 +345,7 @@ class BucketService:
                 'empty_buckets': 0
             }
         
-        stats = buckets.aggregate(
-            total_properties=Count('properties'),
-            avg_properties=Avg('property_count'),
-            max_properties=Max('property_count'),
-            min_properties=Min('property_count')
-        )
-        
-        buckets_with_properties = buckets.filter(property_count__gt=0).count()
+        buckets_with_properties = stats['buckets_with_properties']
         empty_buckets = total_buckets - buckets_with_properties
         
         return {
@@ -213,19 +366,42 @@ class BucketService:
         Returns:
             List of bucket detail dictionaries
         """
-        buckets = GeoBucket.objects.all()
+        from django.db.models import FloatField, Func
+        
+        # Read centroid coordinates in SQL so rows come back as plain
+        # values, without building model instances or GEOS points
+        buckets = GeoBucket.objects.annotate(
+            lat=Func(
+                'centroid',
+                template='ST_Y(%(expressions)s::geometry)',
+                output_field=FloatField()
+            ),
+            lng=Func(
+                'centroid',
+                template='ST_X(%(expressions)s::geometry)',
+                output_field=FloatField()
+            )
+        ).order_by('-property_count', 'normalized_name').values(
+            'id',
+            'h3_index',
+            'normalized_name',
+            'variant_names',
+            'property_count',
+            'lat',
+            'lng'
+        )
         
         return [
             {
-                'id': bucket.id,
-                'h3_index': bucket.h3_index,
-                'normalized_name': bucket.normalized_name,
-                'variant_names': bucket.variant_names,
-                'property_count': bucket.property_count,
+                'id': bucket['id'],
+                'h3_index': bucket['h3_index'],
+                'normalized_name': bucket['normalized_name'],
+                'variant_names': bucket['variant_names'],
+                'property_count': bucket['property_count'],
                 'centroid': {
-                    'lat': bucket.centroid.y,
-                    'lng': bucket.centroid.x
+                    'lat': bucket['lat'],
+                    'lng': bucket['lng']
                 }
             }
-            for bucket in buckets
+            for bucket in buckets.iterator(chunk_size=1000)
         ]
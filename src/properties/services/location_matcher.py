@@ -1,11 +1,61 @@
-import Levenshtein
-from typing import List, Optional
-from django.db.models import Q
+from typing import List, Optional, Tuple
+from django.contrib.gis.geos import Point
+from django.contrib.gis.measure import D
+from django.contrib.postgres.fields import ArrayField
+from django.db.models import (
+    BooleanField,
+    Case,
+    CharField,
+    ExpressionWrapper,
+    FloatField,
+    Func,
+    IntegerField,
+    Q,
+    Value,
+    When,
+)
+from django.db.models.functions import Length
 from properties.models import GeoBucket, LocationIndex
-from properties.services.bucket_service import BucketService
 from properties.services.normalization import LocationNormalizer
 
 
+class LevenshteinLessEqual(Func):
+    """
+    Edit distance between two strings, bounded by a maximum (fuzzystrmatch).
+    
+    Stops early once the distance exceeds the bound and then returns some
+    value greater than it, which is all a threshold filter needs.
+    """
+    function = 'levenshtein_less_equal'
+    arity = 3
+    output_field = IntegerField()
+
+
+class TrigramJaccard(Func):
+    """
+    Jaccard index between two trigram arrays.
+    
+    SQL equivalent of LocationNormalizer.calculate_similarity, so
+    database matches are scored the same way as the Python implementation.
+    """
+    arity = 2
+    output_field = FloatField()
+    template = (
+        '(SELECT COUNT(*) FROM ('
+        'SELECT unnest(%(lhs)s) INTERSECT SELECT unnest(%(rhs)s)'
+        ') AS shared)::float / NULLIF((SELECT COUNT(*) FROM ('
+        'SELECT unnest(%(lhs)s) UNION SELECT unnest(%(rhs)s)'
+        ') AS combined), 0)'
+    )
+
+    def as_sql(self, compiler, connection, **extra_context):
+        lhs, lhs_params = compiler.compile(self.source_expressions[0])
+        rhs, rhs_params = compiler.compile(self.source_expressions[1])
+        sql = self.template % {'lhs': lhs, 'rhs': rhs}
+        params = (*lhs_params, *rhs_params) * 2
+        return sql, params
+
+
 class LocationMatcher:
     """
     Handles fuzzy location matching for property searches.
@@ -23,6 +73,27 @@ class LocationMatcher:
     
     # Levenshtein distance threshold
     MAX_LEVENSHTEIN_DISTANCE = 2
+    
+    # Longest input accepted by fuzzystrmatch's levenshtein functions
+    MAX_LEVENSHTEIN_INPUT_LENGTH = 255
+    
+    # Spatial search radii in meters. Each covers every bucket centroid in
+    # the ring-1 / ring-2 H3 neighborhood (resolution 9) of a point
+    # anywhere in Nigeria (at most ~555m / ~915m away)
+    NEARBY_RADIUS_M = 600
+    EXTENDED_RADIUS_M = 950
+    
+    # Coordinates trusted for spatial search (Nigeria, approximately)
+    LAT_BOUNDS = (4.0, 14.0)
+    LNG_BOUNDS = (3.0, 15.0)
+    
+    # Columns loaded for candidate buckets: enough to score names and
+    # render results, skipping the centroid geometry and other arrays
+    CANDIDATE_FIELDS = ('id', 'h3_index', 'normalized_name', 'normalized_variants')
+    
+    # Order of buckets within each layer: most populated first (GeoBucket
+    # has no default ordering)
+    BUCKET_ORDERING = ('-property_count', 'normalized_name')
 
     @classmethod
     def find_matching_buckets(
@@ -39,27 +110,47 @@ class LocationMatcher:
             return []
         
         normalized_search = LocationNormalizer.normalize(search_term)
-        buckets = []
+        
+        # Matches keyed by id: layers can overlap, and the first layer to
+        # find a bucket decides its position
+        buckets = {}
+        
+        # Layer 2 only runs if coordinates are VALID and TRUSTED; when it
+        # does, its candidates are fetched with Layer 1's in one query
+        has_coords = (
+            lat is not None and lng is not None
+            and cls._validate_coords(lat, lng)
+        )
+        if has_coords:
+            exact_buckets, nearby_buckets = cls._exact_and_nearby_buckets(
+                normalized_search, lat, lng
+            )
+        else:
+            exact_buckets = cls._exact_name_match(normalized_search)
+            nearby_buckets = []
         
         # Layer 1: Exact name match (works without coordinates)
-        buckets.extend(cls._exact_name_match(normalized_search))
+        buckets.update((bucket.id, bucket) for bucket in exact_buckets)
         
         if len(buckets) >= min_results:
-            return cls._deduplicate_buckets(buckets)
+            return list(buckets.values())
         
-        # Layer 2: Only if coordinates are VALID and TRUSTED
-        if lat is not None and lng is not None and cls._validate_coords(lat, lng):
-            spatial_buckets = cls._spatial_name_match(normalized_search, lat, lng)
-            buckets.extend(spatial_buckets)
+        # Layer 2: Spatial + name match
+        if has_coords:
+            spatial_buckets = cls._spatial_name_match(
+                normalized_search,
+                nearby_buckets
+            )
+            buckets.update((bucket.id, bucket) for bucket in spatial_buckets)
             
             if len(buckets) >= min_results:
-                return cls._deduplicate_buckets(buckets)
+                return list(buckets.values())
         
         # Layer 3: Fuzzy name matching (no coordinates needed)
         fuzzy_buckets = cls._fuzzy_name_match(normalized_search)
-        buckets.extend(fuzzy_buckets)
+        buckets.update((bucket.id, bucket) for bucket in fuzzy_buckets)
         
-        return cls._deduplicate_buckets(buckets)
+        return list(buckets.values())
 
     @classmethod
     def _validate_coords(cls, lat: float, lng: float) -> bool:
@@ -70,9 +161,11 @@ class LocationMatcher:
         - Latitude: 4°N to 14°N
         - Longitude: 3°E to 15°E
         """
-        if not (4.0 <= lat <= 14.0):
+        min_lat, max_lat = cls.LAT_BOUNDS
+        min_lng, max_lng = cls.LNG_BOUNDS
+        if not (min_lat <= lat <= max_lat):
             return False
-        if not (3.0 <= lng <= 15.0):
+        if not (min_lng <= lng <= max_lng):
             return False
         return True
 
@@ -87,19 +180,21 @@ class LocationMatcher:
         Returns:
             List of matching buckets
         """
+        # Stored and searched names both come from normalize(), which
+        # lowercases, so plain equality can use the B-tree index
         return list(GeoBucket.objects.filter(
-            normalized_name__iexact=normalized_name
-        ))
+            normalized_name=normalized_name
+        ).only(*cls.CANDIDATE_FIELDS).order_by(*cls.BUCKET_ORDERING))
 
     @classmethod
-    def _spatial_name_match(
+    def _exact_and_nearby_buckets(
         cls,
         normalized_name: str,
         lat: float,
         lng: float
-    ) -> List[GeoBucket]:
+    ) -> Tuple[List[GeoBucket], List[GeoBucket]]:
         """
-        Layer 2: Find buckets in spatial proximity with similar names.
+        Fetch Layer 1 and Layer 2 candidates in a single query.
         
         Args:
             normalized_name: Normalized search term
@@ -107,23 +202,52 @@ class LocationMatcher:
             lng: Longitude
             
         Returns:
-            List of matching buckets
+            Tuple of (exact name matches, buckets in neighboring cells)
         """
-        # Get H3 cell and neighbors
-        h3_index = BucketService.calculate_h3_index(lat, lng)
-        neighbor_indices = BucketService.get_h3_neighbors(h3_index)
+        # Uses the GiST index on centroid
+        nearby = Q(centroid__dwithin=(
+            Point(lng, lat, srid=4326),
+            D(m=cls.NEARBY_RADIUS_M)
+        ))
         
-        # Find buckets in these cells with similar names
-        buckets = GeoBucket.objects.filter(
-            h3_index__in=neighbor_indices
-        )
+        candidates = GeoBucket.objects.filter(
+            Q(normalized_name=normalized_name) | nearby
+        ).annotate(
+            is_nearby=ExpressionWrapper(nearby, output_field=BooleanField())
+        ).only(*cls.CANDIDATE_FIELDS).order_by(*cls.BUCKET_ORDERING)
+        
+        exact_buckets = []
+        nearby_buckets = []
+        for bucket in candidates:
+            if bucket.normalized_name == normalized_name:
+                exact_buckets.append(bucket)
+            if bucket.is_nearby:
+                nearby_buckets.append(bucket)
+        
+        return exact_buckets, nearby_buckets
+
+    @classmethod
+    def _spatial_name_match(
+        cls,
+        normalized_name: str,
+        buckets: List[GeoBucket]
+    ) -> List[GeoBucket]:
+        """
+        Layer 2: Find buckets in spatial proximity with similar names.
         
+        Args:
+            normalized_name: Normalized search term
+            buckets: Buckets in the search point's cell and its neighbors
+            
+        Returns:
+            List of matching buckets
+        """
         # Filter by name similarity
         matching_buckets = []
         for bucket in buckets:
             if cls._is_name_match(normalized_name, bucket.normalized_name):
                 matching_buckets.append(bucket)
-            elif cls._check_variant_names(normalized_name, bucket.variant_names):
+            elif cls._check_variant_names(normalized_name, bucket.normalized_variants):
                 matching_buckets.append(bucket)
         
         return matching_buckets
@@ -133,7 +257,8 @@ class LocationMatcher:
         """
         Layer 3: Find buckets using fuzzy string matching.
         
-        Uses Levenshtein distance and trigram similarity.
+        Uses Levenshtein distance, trigram similarity and metaphone,
+        evaluated by PostgreSQL in a single query.
         
         Args:
             normalized_name: Normalized search term
@@ -141,40 +266,66 @@ class LocationMatcher:
         Returns:
             List of matching buckets
         """
-        matching_buckets = []
-        
-        # Method 1: Levenshtein distance
-        all_buckets = GeoBucket.objects.all()
-        for bucket in all_buckets:
-            distance = Levenshtein.distance(
-                normalized_name,
-                bucket.normalized_name
+        # Method 1: Levenshtein distance (fuzzystrmatch)
+        # levenshtein_less_equal() rejects strings over 255 characters;
+        # stored names never exceed that, so a longer term can't be within
+        # the threshold and the method is skipped
+        max_distance = cls.MAX_LEVENSHTEIN_DISTANCE
+        candidates = GeoBucket.objects.all()
+        bucket_match = Q()
+        if len(normalized_name) <= cls.MAX_LEVENSHTEIN_INPUT_LENGTH:
+            # Names whose lengths differ by more than the threshold can't
+            # be within it; the CASE guard leaves their distance NULL
+            # without computing it
+            candidates = candidates.alias(
+                name_length=Length('normalized_name')
+            ).alias(
+                name_distance=Case(
+                    When(
+                        name_length__range=(
+                            len(normalized_name) - max_distance,
+                            len(normalized_name) + max_distance
+                        ),
+                        then=LevenshteinLessEqual(
+                            'normalized_name',
+                            Value(normalized_name),
+                            Value(max_distance)
+                        )
+                    ),
+                    output_field=IntegerField()
+                )
             )
-            if distance <= cls.MAX_LEVENSHTEIN_DISTANCE:
-                matching_buckets.append(bucket)
+            bucket_match = Q(name_distance__lte=max_distance)
         
         # Method 2: Trigram similarity via LocationIndex
-        indices = LocationIndex.objects.filter(
-            normalized_name__icontains=normalized_name[:3]
-        )
-        
-        for index in indices:
-            similarity = LocationNormalizer.calculate_similarity(
-                normalized_name,
-                index.normalized_name
+        # Any name scoring above zero shares a trigram, so the GIN-backed
+        # overlap filter narrows candidates before similarity is computed
+        trigrams = sorted(LocationNormalizer.generate_trigrams(normalized_name))
+        if trigrams:
+            index_match = Q(
+                trigrams__overlap=trigrams,
+                similarity__gte=cls.ACCEPTABLE_MATCH_THRESHOLD
             )
-            if similarity >= cls.ACCEPTABLE_MATCH_THRESHOLD:
-                matching_buckets.append(index.bucket)
+        else:
+            # Too short for trigrams: similarity is an exact comparison
+            index_match = Q(normalized_name=normalized_name)
         
-        # Method 3: Metaphone matching
+        # Method 3: Metaphone matching against the bucket's own variant
+        # codes (GIN-indexed), without going through LocationIndex
         metaphone = LocationNormalizer.metaphone_simple(normalized_name)
         if metaphone:
-            metaphone_indices = LocationIndex.objects.filter(
-                metaphone=metaphone
+            bucket_match |= Q(variant_metaphones__contains=[metaphone])
+        
+        indexed_bucket_ids = LocationIndex.objects.alias(
+            similarity=TrigramJaccard(
+                'trigrams',
+                Value(trigrams, output_field=ArrayField(CharField(max_length=3)))
             )
-            matching_buckets.extend([idx.bucket for idx in metaphone_indices])
+        ).filter(index_match).values('bucket_id')
         
-        return matching_buckets
+        return list(candidates.filter(
+            bucket_match | Q(id__in=indexed_bucket_ids)
+        ).only(*cls.CANDIDATE_FIELDS).order_by(*cls.BUCKET_ORDERING))
 
     @classmethod
     def _extended_spatial_match(
@@ -194,14 +345,13 @@ class LocationMatcher:
         Returns:
             List of matching buckets
         """
-        # Get extended neighbors (2-ring)
-        h3_index = BucketService.calculate_h3_index(lat, lng)
-        neighbor_indices = BucketService.get_h3_neighbors_extended(h3_index)
-        
-        # Find buckets in extended area
+        # Find buckets in the extended area
         buckets = GeoBucket.objects.filter(
-            h3_index__in=neighbor_indices
-        )
+            centroid__dwithin=(
+                Point(lng, lat, srid=4326),
+                D(m=cls.EXTENDED_RADIUS_M)
+            )
+        ).only(*cls.CANDIDATE_FIELDS).order_by(*cls.BUCKET_ORDERING)
         
         # Apply relaxed name matching
         matching_buckets = []
@@ -255,38 +405,16 @@ class LocationMatcher:
         
         Args:
             search_name: Search term
-            variant_names: List of variant names
+            variant_names: List of normalized variant names
             
         Returns:
             True if any variant matches
         """
         for variant in variant_names:
-            normalized_variant = LocationNormalizer.normalize(variant)
-            if cls._is_name_match(search_name, normalized_variant):
+            if cls._is_name_match(search_name, variant):
                 return True
         return False
 
-    @classmethod
-    def _deduplicate_buckets(cls, buckets: List[GeoBucket]) -> List[GeoBucket]:
-        """
-        Remove duplicate buckets from list.
-        
-        Args:
-            buckets: List of buckets (may contain duplicates)
-            
-        Returns:
-            Deduplicated list of buckets
-        """
-        seen_ids = set()
-        unique_buckets = []
-        
-        for bucket in buckets:
-            if bucket.id not in seen_ids:
-                seen_ids.add(bucket.id)
-                unique_buckets.append(bucket)
-        
-        return unique_buckets
-
     @classmethod
     def geocode_location(cls, location_name: str) -> Optional[tuple]:
         """
@@ -303,9 +431,10 @@ class LocationMatcher:
         """
         # For now, search existing buckets for similar names
         normalized = LocationNormalizer.normalize(location_name)
+        # Prefer the most populated bucket with this name
         bucket = GeoBucket.objects.filter(
-            normalized_name__iexact=normalized
-        ).first()
+            normalized_name=normalized
+        ).only('centroid').order_by(*cls.BUCKET_ORDERING).first()
         
         if bucket:
             return bucket.centroid.y, bucket.centroid.x
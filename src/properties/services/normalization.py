@@ -1,5 +1,30 @@
 import re
-from typing import List
+from functools import lru_cache
+from typing import FrozenSet, List, Tuple
+
+
+# Pattern used on every normalize call, compiled once
+_NON_ALNUM_RE = re.compile(r'[^a-z0-9\s]')
+
+# Phonetic encoding tables for metaphone_simple
+_VOWELS = frozenset('AEIOU')
+_DIGRAPHS = {
+    'PH': 'F',
+    'CK': 'K',
+    'SH': 'X',
+    'CH': 'X',
+}
+_DIGRAPH_STARTS = frozenset(digraph[0] for digraph in _DIGRAPHS)
+
+
+@lru_cache(maxsize=10_000)
+def _trigrams(text: str) -> FrozenSet[str]:
+    """Cached trigram set; the same names are compared many times."""
+    if not text or len(text) < 3:
+        return frozenset()
+    
+    text = text.lower().replace(' ', '')
+    return frozenset(text[i:i+3] for i in range(len(text) - 2))
 
 
 class LocationNormalizer:
@@ -9,10 +34,10 @@ class LocationNormalizer:
     """
     
     # Common location suffixes to remove (Nigerian context)
-    COMMON_SUFFIXES = {
+    COMMON_SUFFIXES = frozenset({
         'lagos', 'nigeria', 'ng',
         'lga', 'state', 'area'
-    }
+    })
     
     # Location name replacements for standardization
     REPLACEMENTS = {
@@ -21,8 +46,21 @@ class LocationNormalizer:
         'ave': 'avenue',
         'st': 'street',
     }
+    
+    # Abbreviations between two words, as (old, new) with the spaces
+    # included. Applied with str.replace one at a time: repeated
+    # abbreviations ("rd rd") share a space, so only the first is replaced,
+    # and stored normalized names depend on that
+    REPLACEMENT_PAIRS = tuple(
+        (f' {old} ', f' {new} ') for old, new in REPLACEMENTS.items()
+    )
+    
+    # Entries kept by the normalize/metaphone caches; popular location
+    # names repeat across searches and bucket writes
+    CACHE_SIZE = 65_536
 
     @classmethod
+    @lru_cache(maxsize=CACHE_SIZE)
     def normalize(cls, name: str) -> str:
         """
         Normalize a location name for consistent matching.
@@ -52,29 +90,27 @@ class LocationNormalizer:
         normalized = name.lower().strip()
         
         # Remove special characters, keep alphanumeric and spaces
-        normalized = re.sub(r'[^a-z0-9\s]', ' ', normalized)
+        normalized = _NON_ALNUM_RE.sub(' ', normalized)
         
-        # Collapse multiple spaces
-        normalized = re.sub(r'\s+', ' ', normalized)
-        
-        # Remove common suffixes
+        # Split on whitespace runs (this also collapses them) and remove
+        # common suffixes with a set lookup per word
         words = normalized.split()
         filtered_words = [w for w in words if w not in cls.COMMON_SUFFIXES]
         
         # If we filtered out everything, keep the original
         if not filtered_words:
-            filtered_words = normalized.split()[:2]  # Keep first 2 words
+            filtered_words = words[:2]  # Keep first 2 words
         
         normalized = ' '.join(filtered_words)
         
         # Apply replacements
-        for old, new in cls.REPLACEMENTS.items():
-            normalized = normalized.replace(f' {old} ', f' {new} ')
+        for old, new in cls.REPLACEMENT_PAIRS:
+            normalized = normalized.replace(old, new)
         
         return normalized.strip()
 
     @classmethod
-    def generate_trigrams(cls, text: str) -> List[str]:
+    def generate_trigrams(cls, text: str) -> FrozenSet[str]:
         """
         Generate trigrams from text for fuzzy matching.
         
@@ -82,21 +118,12 @@ class LocationNormalizer:
             text: Input text
             
         Returns:
-            List of trigrams
+            Set of distinct trigrams
             
         Example:
-            "sangotedo" -> ["san", "ang", "ngo", "got", "ote", "ted", "edo"]
+            "sangotedo" -> {"san", "ang", "ngo", "got", "ote", "ted", "edo"}
         """
-        if not text or len(text) < 3:
-            return []
-        
-        text = text.lower().replace(' ', '')
-        trigrams = []
-        
-        for i in range(len(text) - 2):
-            trigrams.append(text[i:i+3])
-        
-        return trigrams
+        return _trigrams(text)
 
     @classmethod
     def generate_variants(cls, name: str) -> List[str]:
@@ -127,6 +154,26 @@ class LocationNormalizer:
         return list(variants)
 
     @classmethod
+    def variant_keys(cls, names: List[str]) -> Tuple[List[str], List[str]]:
+        """
+        Derive the matching keys stored for a bucket's variant names.
+        
+        Args:
+            names: Original location name variants
+            
+        Returns:
+            Tuple of (distinct normalized names, their distinct metaphones)
+        """
+        normalized = (cls.normalize(name) for name in names)
+        normalized_variants = list(dict.fromkeys(name for name in normalized if name))
+        
+        metaphones = (cls.metaphone_simple(name) for name in normalized_variants)
+        variant_metaphones = list(dict.fromkeys(code for code in metaphones if code))
+        
+        return normalized_variants, variant_metaphones
+
+    @classmethod
+    @lru_cache(maxsize=CACHE_SIZE)
     def metaphone_simple(cls, text: str) -> str:
         """
         Simple phonetic encoding (metaphone-like).
@@ -144,29 +191,38 @@ class LocationNormalizer:
         if not text:
             return ""
         
-        text = text.upper()
-        
-        # Remove vowels except at start
-        if len(text) > 1:
-            result = text[0] + re.sub(r'[AEIOU]', '', text[1:])
-        else:
-            result = text
-        
-        # Remove duplicate consonants
-        result = re.sub(r'(.)\1+', r'\1', result)
-        
-        # Common phonetic replacements
-        replacements = {
-            'PH': 'F',
-            'CK': 'K',
-            'SH': 'X',
-            'CH': 'X',
-        }
+        # Single pass: drop vowels except at start, collapse repeated
+        # characters, then replace digraphs (PH, CK, SH, CH) among what's
+        # left. A digraph start is held back until the next kept char.
+        result = []
+        previous = None
+        pending = None
+        
+        for position, char in enumerate(text.upper()):
+            if position and char in _VOWELS:
+                continue
+            if char == previous and char != '\n':  # newlines are not collapsed
+                continue
+            previous = char
+            
+            if pending is not None:
+                replacement = _DIGRAPHS.get(pending + char)
+                if replacement:
+                    result.append(replacement)
+                    pending = None
+                    continue
+                result.append(pending)
+                pending = None
+            
+            if char in _DIGRAPH_STARTS:
+                pending = char
+            else:
+                result.append(char)
         
-        for old, new in replacements.items():
-            result = result.replace(old, new)
+        if pending is not None:
+            result.append(pending)
         
-        return result[:10]  # Limit length
+        return ''.join(result)[:10]  # Limit length
 
     @classmethod
     def calculate_similarity(cls, str1: str, str2: str) -> float:
@@ -183,13 +239,14 @@ class LocationNormalizer:
         if not str1 or not str2:
             return 0.0
         
-        trigrams1 = set(cls.generate_trigrams(str1))
-        trigrams2 = set(cls.generate_trigrams(str2))
+        trigrams1 = cls.generate_trigrams(str1)
+        trigrams2 = cls.generate_trigrams(str2)
         
         if not trigrams1 or not trigrams2:
             return 1.0 if str1.lower() == str2.lower() else 0.0
         
+        # |A | B| = |A| + |B| - |A & B|, without building the union set
         intersection = len(trigrams1 & trigrams2)
-        union = len(trigrams1 | trigrams2)
+        union = len(trigrams1) + len(trigrams2) - intersection
         
-        return intersection / union if union > 0 else 0.0
+        return intersection / union
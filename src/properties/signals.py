@@ -0,0 +1,181 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import Q
+from properties.services.normalization import LocationNormalizer
+
+
+# Extensions required by the model indexes (trigram GIN operator classes)
+# and by fuzzy matching queries (levenshtein())
+REQUIRED_EXTENSIONS = ['pg_trgm', 'fuzzystrmatch']
+
+# Keeps geo_buckets.property_count in sync with the properties table.
+# Runs server-side so bulk_create, bulk_update and queryset updates are
+# counted as well, without extra round-trips from the application.
+PROPERTY_COUNT_TRIGGER_SQL = """
+CREATE OR REPLACE FUNCTION geo_buckets_sync_property_count()
+RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.bucket_id IS NOT NULL THEN
+        UPDATE geo_buckets
+        SET property_count = GREATEST(property_count - 1, 0),
+            updated_at = NOW()
+        WHERE id = OLD.bucket_id;
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.bucket_id IS NOT NULL THEN
+        UPDATE geo_buckets
+        SET property_count = property_count + 1,
+            updated_at = NOW()
+        WHERE id = NEW.bucket_id;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS properties_bucket_count_insert_delete ON properties;
+CREATE TRIGGER properties_bucket_count_insert_delete
+AFTER INSERT OR DELETE ON properties
+FOR EACH ROW EXECUTE FUNCTION geo_buckets_sync_property_count();
+
+DROP TRIGGER IF EXISTS properties_bucket_count_update ON properties;
+CREATE TRIGGER properties_bucket_count_update
+AFTER UPDATE OF bucket_id ON properties
+FOR EACH ROW
+WHEN (OLD.bucket_id IS DISTINCT FROM NEW.bucket_id)
+EXECUTE FUNCTION geo_buckets_sync_property_count();
+
+-- Recount from scratch: the trigger only applies deltas, so correct any
+-- drift from writes made before it was installed
+UPDATE geo_buckets
+SET property_count = counts.total
+FROM (
+    SELECT geo_buckets.id, COUNT(properties.id) AS total
+    FROM geo_buckets
+    LEFT JOIN properties ON properties.bucket_id = geo_buckets.id
+    GROUP BY geo_buckets.id
+) AS counts
+WHERE geo_buckets.id = counts.id
+  AND geo_buckets.property_count <> counts.total;
+"""
+
+
+def create_required_extensions(sender, using=DEFAULT_DB_ALIAS, **kwargs):
+    """
+    Create PostgreSQL extensions before migrations run.
+
+    Connected to pre_migrate because indexes using their operator classes
+    are created while the schema is built.
+    """
+    connection = connections[using]
+
+    if connection.vendor != 'postgresql':
+        return
+
+    with connection.cursor() as cursor:
+        for extension in REQUIRED_EXTENSIONS:
+            cursor.execute(f'CREATE EXTENSION IF NOT EXISTS {extension}')
+
+
+# Copies the bucket's H3 index onto each property so reads don't need to
+# join geo_buckets. Bucket H3 indexes never change, so syncing on
+# insert and on bucket reassignment is enough.
+PROPERTY_H3_INDEX_TRIGGER_SQL = """
+CREATE OR REPLACE FUNCTION properties_sync_h3_index()
+RETURNS trigger AS $$
+BEGIN
+    IF NEW.bucket_id IS NULL THEN
+        NEW.h3_index := NULL;
+    ELSE
+        SELECT h3_index INTO NEW.h3_index
+        FROM geo_buckets
+        WHERE id = NEW.bucket_id;
+    END IF;
+
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS properties_h3_index_insert ON properties;
+CREATE TRIGGER properties_h3_index_insert
+BEFORE INSERT ON properties
+FOR EACH ROW EXECUTE FUNCTION properties_sync_h3_index();
+
+DROP TRIGGER IF EXISTS properties_h3_index_update ON properties;
+CREATE TRIGGER properties_h3_index_update
+BEFORE UPDATE OF bucket_id ON properties
+FOR EACH ROW
+WHEN (OLD.bucket_id IS DISTINCT FROM NEW.bucket_id)
+EXECUTE FUNCTION properties_sync_h3_index();
+
+-- Backfill rows written before the column existed
+UPDATE properties
+SET h3_index = geo_buckets.h3_index
+FROM geo_buckets
+WHERE properties.bucket_id = geo_buckets.id
+  AND properties.h3_index IS DISTINCT FROM geo_buckets.h3_index;
+"""
+
+
+def _tables_exist(connection, *tables):
+    """Whether all tables exist (post_migrate also runs after unapplying)."""
+    existing = set(connection.introspection.table_names())
+    return all(table in existing for table in tables)
+
+
+def install_triggers(sender, using=DEFAULT_DB_ALIAS, **kwargs):
+    """
+    Install the denormalization triggers after migrations run.
+
+    Connected to post_migrate so the triggers exist on every database
+    the schema is created on, including the test database.
+    """
+    connection = connections[using]
+
+    if connection.vendor != 'postgresql':
+        return
+
+    if not _tables_exist(connection, 'geo_buckets', 'properties'):
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute(PROPERTY_COUNT_TRIGGER_SQL)
+        cursor.execute(PROPERTY_H3_INDEX_TRIGGER_SQL)
+
+
+def backfill_variant_keys(sender, apps, using=DEFAULT_DB_ALIAS, **kwargs):
+    """
+    Populate GeoBucket variant keys for rows written before they existed.
+
+    Normalization and metaphone encoding happen in Python, so unlike the
+    trigger backfills this can't be done in SQL. Only buckets with
+    variants but missing keys are touched, so later migrate runs are cheap.
+    Uses the migration state's model, which has no custom methods.
+    """
+    if not _tables_exist(connections[using], 'geo_buckets'):
+        return
+
+    try:
+        GeoBucket = apps.get_model('properties', 'GeoBucket')
+        GeoBucket._meta.get_field('variant_metaphones')
+    except (LookupError, FieldDoesNotExist):
+        # Not in the migration state yet (makemigrations hasn't run)
+        return
+
+    buckets = list(
+        GeoBucket.objects.using(using)
+        .filter(Q(normalized_variants=[]) | Q(variant_metaphones=[]))
+        .exclude(variant_names=[])
+        .only('id', 'variant_names')
+    )
+
+    for bucket in buckets:
+        bucket.normalized_variants, bucket.variant_metaphones = (
+            LocationNormalizer.variant_keys(bucket.variant_names)
+        )
+
+    GeoBucket.objects.using(using).bulk_update(
+        buckets,
+        ['normalized_variants', 'variant_metaphones'],
+        batch_size=500
+    )
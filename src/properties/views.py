@@ -6,16 +6,43 @@ from django.db.models import Q
 from properties.models import Property, GeoBucket
 from properties.serializers import (
     PropertySerializer,
-    PropertySearchSerializer,
+    PropertySearchQuerySerializer,
     BucketStatsSerializer,
-    GeoBucketSerializer
+    GeoBucketSerializer,
+    GeoBucketListSerializer
 )
 from properties.services.location_matcher import LocationMatcher
 from properties.services.bucket_service import BucketService
 
 
+class EagerLoadingMixin:
+    """
+    Apply the serializer's setup_eager_loading() to the viewset queryset.
+    
+    Keeps related-object loading next to the serializer that reads the
+    related fields, so list endpoints stay at a constant query count.
+    
+    Only read actions are narrowed: save() on an instance with deferred
+    fields writes just the loaded ones, so updates must load every column.
+    """
+    
+    eager_loading_actions = ('list', 'retrieve', 'search')
+    
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        serializer_class = self.get_serializer_class()
+        
+        if (
+            self.action in self.eager_loading_actions
+            and hasattr(serializer_class, 'setup_eager_loading')
+        ):
+            queryset = serializer_class.setup_eager_loading(queryset)
+        
+        return queryset
+
+
 # Create your views here.
-class PropertyViewSet(viewsets.ModelViewSet):
+class PropertyViewSet(EagerLoadingMixin, viewsets.ModelViewSet):
     """
     ViewSet for Property CRUD operations and location-based search.
     
@@ -28,7 +55,7 @@ class PropertyViewSet(viewsets.ModelViewSet):
     - GET /api/properties/search/?location=<name> - Search by location
     """
     
-    queryset = Property.objects.select_related('bucket').all()
+    queryset = Property.objects.order_by('-created_at')
     serializer_class = PropertySerializer
 
     def create(self, request, *args, **kwargs):
@@ -76,31 +103,18 @@ class PropertyViewSet(viewsets.ModelViewSet):
         - Typo tolerance
         - Location name variant support
         """
-        location = request.query_params.get('location')
+        query = PropertySearchQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            # Only location can fail (bad coordinates are dropped); keep
+            # reporting it as a single message rather than a list
+            raise ValidationError({'location': query.errors['location'][0]})
         
-        if not location:
-            raise ValidationError({
-                'location': 'This query parameter is required'
-            })
+        location = query.validated_data['location']
         
-        # Optional coordinates for spatial search
-        lat = request.query_params.get('lat')
-        lng = request.query_params.get('lng')
-        
-        # Convert and validate coordinates if provided
-        if lat and lng:
-            try:
-                lat = float(lat)
-                lng = float(lng)
-                
-                # Validate Nigeria bounds
-                if not (4.0 <= lat <= 14.0 and 3.0 <= lng <= 15.0):
-                    # Log warning but continue with name-only search
-                    lat, lng = None, None
-                    
-            except (ValueError, TypeError):
-                # Invalid coordinates - fall back to name-only search
-                lat, lng = None, None
+        # Optional coordinates for spatial search; invalid or
+        # out-of-bounds values were already dropped by the serializer
+        lat = query.validated_data.get('lat')
+        lng = query.validated_data.get('lng')
         
         # Find matching buckets (works with or without coordinates)
         matching_buckets = LocationMatcher.find_matching_buckets(
@@ -116,11 +130,22 @@ class PropertyViewSet(viewsets.ModelViewSet):
                 'message': f'No properties found for location: {location}'
             })
         
-        # Get all properties in matching buckets
+        # Get all properties in matching buckets, loading only the
+        # columns the results below use
         bucket_ids = [bucket.id for bucket in matching_buckets]
         properties = Property.objects.filter(
             bucket_id__in=bucket_ids
-        ).select_related('bucket').order_by('-created_at')
+        ).select_related('bucket').only(
+            'id',
+            'title',
+            'location_name',
+            'location',
+            'price',
+            'bedrooms',
+            'bathrooms',
+            'created_at',
+            'bucket__normalized_name',
+        ).order_by('-created_at')
         
         # Serialize results
         results = []
@@ -146,19 +171,24 @@ class PropertyViewSet(viewsets.ModelViewSet):
         })
 
 
-class GeoBucketViewSet(viewsets.ReadOnlyModelViewSet):
+class GeoBucketViewSet(EagerLoadingMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet for GeoBucket read operations and statistics.
     
     Endpoints:
-    - GET /api/geo-buckets/ - List all buckets
-    - GET /api/geo-buckets/{id}/ - Get specific bucket
+    - GET /api/geo-buckets/ - List all buckets (summary fields)
+    - GET /api/geo-buckets/{id}/ - Get specific bucket (all fields)
     - GET /api/geo-buckets/stats/ - Get bucket statistics
     """
     
-    queryset = GeoBucket.objects.all()
+    queryset = GeoBucket.objects.order_by('-property_count', 'normalized_name')
     serializer_class = GeoBucketSerializer
 
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return GeoBucketListSerializer
+        return super().get_serializer_class()
+
     @action(detail=False, methods=['get'], url_path='stats')
     def stats(self, request):
         """
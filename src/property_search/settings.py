@@ -103,6 +103,9 @@ DATABASES = {
         'PASSWORD': os.getenv('DATABASE_PASSWORD', 'property_pass'),
         'HOST': os.getenv('DATABASE_HOST', 'localhost'),
         'PORT': os.getenv('DATABASE_PORT', '5432'),
+        # Keep connections open between requests instead of reconnecting
+        'CONN_MAX_AGE': int(os.getenv('DATABASE_CONN_MAX_AGE', '60')),
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
@@ -43,6 +43,7 @@ class TestPropertyAPI:
         prop = Property.objects.get(id=response.data['id'])
         assert prop.title == data['title']
         assert prop.bucket is not None
+        assert response.data['bucket_h3_index'] == prop.bucket.h3_index
     
     def test_create_property_invalid_coordinates(self, api_client):
         """Test creating property with invalid coordinates fails."""
@@ -65,26 +66,44 @@ class TestPropertyAPI:
         assert response.status_code == status.HTTP_400_BAD_REQUEST
         assert 'lat' in response.data
     
-    def test_list_properties(self, api_client):
+    def test_list_properties(self, api_client, django_assert_num_queries):
         """Test GET /api/properties/ lists all properties."""
-        # Create test properties
-        for i in range(3):
-            Property.objects.create(
+        # Create test properties, each in its own bucket, so rendering
+        # bucket_name would need a query per row without the join
+        coordinates = [(6.5 + i*0.01, 3.5 + i*0.01) for i in range(3)]
+        buckets = BucketService.find_or_create_buckets_bulk([
+            (lat, lng, f"Location {i}")
+            for i, (lat, lng) in enumerate(coordinates)
+        ])
+        Property.objects.bulk_create([
+            Property(
                 title=f"Property {i}",
-                location_name="Test Location",
-                location=Point(3.5 + i*0.01, 6.5 + i*0.01, srid=4326),
+                location_name=f"Location {i}",
+                location=Point(lng, lat, srid=4326),
+                bucket=bucket,
                 price=10000000,
                 bedrooms=2,
                 bathrooms=1
             )
+            for i, ((lat, lng), bucket) in enumerate(zip(coordinates, buckets))
+        ])
         
-        response = api_client.get('/api/properties/')
+        # Count + page, with buckets joined rather than fetched per row
+        with django_assert_num_queries(2):
+            response = api_client.get('/api/properties/')
         
         assert response.status_code == status.HTTP_200_OK
         assert response.data['count'] == 3
         assert len(response.data['results']) == 3
+        assert {
+            result['bucket_name'] for result in response.data['results']
+        } == {bucket.normalized_name for bucket in buckets}
     
-    def test_search_properties_by_location(self, api_client):
+    def test_search_properties_by_location(
+        self,
+        api_client,
+        django_assert_num_queries
+    ):
         """Test GET /api/properties/search/?location=X returns properties."""
         # Create properties with Sangotedo variations
         locations = [
@@ -93,26 +112,28 @@ class TestPropertyAPI:
             ("sangotedo lagos", 6.4705, 3.6290)
         ]
         
-        for location_name, lat, lng in locations:
-            prop = Property.objects.create(
+        # Resolve all buckets in one pass
+        buckets = BucketService.find_or_create_buckets_bulk([
+            (lat, lng, location_name)
+            for location_name, lat, lng in locations
+        ])
+        
+        Property.objects.bulk_create([
+            Property(
                 title=f"Property in {location_name}",
                 location_name=location_name,
                 location=Point(lng, lat, srid=4326),
+                bucket=bucket,
                 price=15000000,
                 bedrooms=3,
                 bathrooms=2
             )
-            # Assign bucket
-            bucket = BucketService.find_or_create_bucket(
-                lat=lat,
-                lng=lng,
-                location_name=location_name
-            )
-            prop.bucket = bucket
-            prop.save()
+            for (location_name, lat, lng), bucket in zip(locations, buckets)
+        ])
         
-        # Search for "sangotedo"
-        response = api_client.get('/api/properties/search/?location=sangotedo')
+        # Search for "sangotedo": exact match, fuzzy match, properties
+        with django_assert_num_queries(3):
+            response = api_client.get('/api/properties/search/?location=sangotedo')
         
         assert response.status_code == status.HTTP_200_OK
         assert response.data['count'] == 3
@@ -126,6 +147,19 @@ class TestPropertyAPI:
         
         assert response.status_code == status.HTTP_400_BAD_REQUEST
         assert 'location' in response.data
+        assert response.data['location'] == "This query parameter is required"
+        
+        # Malformed coordinates don't add errors of their own
+        response = api_client.get('/api/properties/search/?lat=abc&lng=xyz')
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data == {'location': "This query parameter is required"}
+        
+        # Terms longer than a stored location name are rejected
+        response = api_client.get(f'/api/properties/search/?location={"x" * 300}')
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'location' in response.data
     
     def test_search_nonexistent_location(self, api_client):
         """Test search for nonexistent location returns empty."""
@@ -163,6 +197,15 @@ class TestPropertyAPI:
         
         assert response.status_code == status.HTTP_200_OK
         assert response.data['count'] >= 1
+        
+        # Malformed or out-of-bounds coordinates fall back to name search
+        for params in ('lat=abc&lng=3.4716', 'lat=51.5&lng=-0.12', 'lat=6.4474'):
+            response = api_client.get(
+                f'/api/properties/search/?location=lekki&{params}'
+            )
+            
+            assert response.status_code == status.HTTP_200_OK
+            assert response.data['count'] >= 1
     
     def test_update_property(self, api_client):
         """Test PUT /api/properties/{id}/ updates property."""
@@ -197,7 +240,7 @@ class TestPropertyAPI:
         assert response.data['title'] == "Updated Title"
         
         # Verify update
-        prop.refresh_from_db()
+        prop = Property.objects.only('title', 'bedrooms').get(id=prop.id)
         assert prop.title == "Updated Title"
         assert prop.bedrooms == 3
     
@@ -242,6 +285,17 @@ class TestGeoBucketAPI:
         
         assert response.status_code == status.HTTP_200_OK
         assert response.data['count'] == 3
+        
+        # Summary fields only; the centroid and variants are detail-only
+        for result in response.data['results']:
+            assert set(result) == {
+                'id',
+                'h3_index',
+                'normalized_name',
+                'property_count',
+                'created_at',
+                'updated_at',
+            }
     
     def test_get_bucket_stats(self, api_client):
         """Test GET /api/geo-buckets/stats/ returns statistics."""
@@ -253,17 +307,19 @@ class TestGeoBucketAPI:
         )
         
         # Create properties
-        for i in range(5):
-            prop = Property.objects.create(
+        location = Point(3.3, 6.5, srid=4326)
+        Property.objects.bulk_create([
+            Property(
                 title=f"Property {i}",
                 location_name="Test Location",
-                location=Point(3.3, 6.5, srid=4326),
+                location=location,
                 bucket=bucket,
                 price=10000000,
                 bedrooms=2,
                 bathrooms=1
             )
-            bucket.increment_property_count()
+            for i in range(5)
+        ])
         
         response = api_client.get('/api/geo-buckets/stats/')
         
@@ -303,3 +359,14 @@ class TestGeoBucketAPI:
         assert 'h3_index' in response.data
         assert 'centroid_lat' in response.data
         assert 'centroid_lng' in response.data
+        assert set(response.data) == {
+            'id',
+            'h3_index',
+            'centroid_lat',
+            'centroid_lng',
+            'normalized_name',
+            'variant_names',
+            'property_count',
+            'created_at',
+            'updated_at',
+        }